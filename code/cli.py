@@ -0,0 +1,39 @@
+import argparse
+import importlib
+import sys
+from typing import List
+
+# subcommand -> (module, description), modules are imported only when needed
+COMMANDS = {
+    "parse": ("parse", "parse EuroSense or SEW, filter EuroSense, build the dictionary"),
+    "dedup": ("dedup", "remove duplicate sentences from a parsed corpus"),
+    "stats": ("stats", "compute statistics of the parsed corpora"),
+    "train": ("train", "train the sense embeddings"),
+    "sweep": ("sweep", "hyperparameter sweep over train and score"),
+    "score": ("score", "evaluate the sense embeddings on word similarity"),
+    "disambiguate": ("disambiguate", "pick the sense of words in sentences"),
+    "merge": ("merge", "align and merge embeddings trained on different shards"),
+}
+
+
+def main(argv: List[str] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(
+        prog="sense-embedding",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n"
+        + "\n".join(
+            "  {:<14}{}".format(name, description)
+            for name, (_, description) in COMMANDS.items()
+        )
+        + "\n\nrun 'sense-embedding COMMAND -h' for the options of a command",
+    )
+    parser.add_argument(help="command to run", dest="command", choices=COMMANDS)
+    # the options of the command are parsed by its own module
+    args = parser.parse_args(argv[:1])
+    module = importlib.import_module(COMMANDS[args.command][0])
+    module.cli(argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import argparse
+import hashlib
+import heapq
+import json
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# key, line number * 2 + kind (0 exact, 1 near duplicate)
+RECORD = struct.Struct("<QQ")
+# prime for the minhash permutations
+PRIME = (1 << 31) - 1
+
+
+def _hash(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class MinHash(object):
+    """Locality sensitive hashing of sentences, on word trigrams."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 42):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, PRIME, size=(num_perm, 1)).astype(np.uint64)
+        self.b = rng.randint(0, PRIME, size=(num_perm, 1)).astype(np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+
+    def keys(self, tokens: List[str]) -> List[int]:
+        """
+        Compute a key for each band of the signature, similar sentences
+        are likely to share at least one key.
+        :param tokens: tokens of the sentence.
+        :return: the band keys.
+        """
+        if not tokens:
+            return []
+        shingles = {
+            " ".join(tokens[i : i + 3]) for i in range(max(len(tokens) - 2, 1))
+        }
+        x = np.array(
+            [_hash(s.encode("utf8")) & 0xFFFFFFFF for s in shingles], dtype=np.uint64
+        )
+        signature = ((self.a * x + self.b) % np.uint64(PRIME)).min(axis=1)
+        return [
+            _hash(bytes([band]) + signature[start : start + self.rows].tobytes())
+            for band, start in enumerate(range(0, len(signature), self.rows))
+        ]
+
+
+def _read_records(path: Path) -> Iterable[tuple]:
+    with open(str(path), mode="rb") as file:
+        for chunk in iter(lambda: file.read(RECORD.size * 65536), b""):
+            yield from RECORD.iter_unpack(chunk)
+
+
+def _read_ints(path: Path) -> Iterable[int]:
+    with open(str(path), mode="rb") as file:
+        for chunk in iter(lambda: file.read(8 * 65536), b""):
+            yield from array("Q", chunk)
+
+
+def dedup(
+    path_input: str,
+    path_output: str,
+    near: bool = False,
+    partitions: int = 64,
+    num_perm: int = 64,
+    bands: int = 16,
+) -> Dict:
+    """
+    Remove duplicate sentences, keeping the first occurrence. Keys are spread
+    on disk partitions, so only one partition at a time is kept in memory.
+    :param path_input: parsed corpus.
+    :param path_output: path where to save the deduplicated corpus.
+    :param near: if True, near duplicates are removed too, with MinHash.
+    :param partitions: number of partitions on disk.
+    :param num_perm: number of minhash permutations.
+    :param bands: number of bands of the minhash signature.
+    :return: a report of the removed lines, bytes and tokens.
+    """
+    minhash = MinHash(num_perm, bands) if near else None
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        # write the keys of each line in its partitions
+        parts = [
+            open(str(tmp / (str(p) + ".bin")), mode="wb") for p in range(partitions)
+        ]
+        with open(path_input, mode="rb") as file:
+            for line_no, line in enumerate(file):
+                line = line.strip()
+                key = _hash(line)
+                parts[key % partitions].write(RECORD.pack(key, line_no * 2))
+                if minhash:
+                    for key in minhash.keys(line.decode("utf8").split()):
+                        record = RECORD.pack(key, line_no * 2 + 1)
+                        parts[key % partitions].write(record)
+        for part in parts:
+            part.close()
+
+        # find the duplicates of each partition, records are in line order
+        drops = []
+        for p in range(partitions):
+            first, duplicates = {}, array("Q")
+            for key, value in _read_records(tmp / (str(p) + ".bin")):
+                if first.setdefault(key, value >> 1) != value >> 1:
+                    duplicates.append(value)
+            drops.append(tmp / (str(p) + ".drop"))
+            with open(str(drops[-1]), mode="wb") as file:
+                array("Q", sorted(duplicates)).tofile(file)
+
+        # copy the lines that are not duplicates
+        report = {
+            "lines": 0,
+            "exact_duplicates": 0,
+            "near_duplicates": 0,
+            "bytes": 0,
+            "bytes_saved": 0,
+            "tokens": 0,
+            "tokens_saved": 0,
+        }
+        duplicates = heapq.merge(*(_read_ints(path) for path in drops))
+        drop = next(duplicates, None)
+        with open(path_input, mode="rb") as file, open(path_output, mode="wb") as out:
+            for line_no, line in enumerate(file):
+                tokens = len(line.split())
+                report["lines"] += 1
+                report["bytes"] += len(line)
+                report["tokens"] += tokens
+                if drop is not None and drop >> 1 == line_no:
+                    # exact duplicates come first
+                    kind = "near" if drop & 1 else "exact"
+                    report[kind + "_duplicates"] += 1
+                    report["bytes_saved"] += len(line)
+                    report["tokens_saved"] += tokens
+                    while drop is not None and drop >> 1 == line_no:
+                        drop = next(duplicates, None)
+                else:
+                    out.write(line)
+    return report
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(help="path to the parsed corpus", dest="input")
+    parser.add_argument(
+        "-o",
+        help="path where to save the deduplicated corpus",
+        required=True,
+        dest="output",
+    )
+    parser.add_argument(
+        "--near",
+        help="remove near duplicates too, with MinHash",
+        dest="near",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--partitions",
+        help="number of hash partitions on disk, more partitions use less memory",
+        dest="partitions",
+        default=64,
+        type=int,
+    )
+    parser.add_argument(
+        "--num-perm",
+        help="number of minhash permutations",
+        dest="num_perm",
+        default=64,
+        type=int,
+    )
+    parser.add_argument(
+        "--bands",
+        help="number of bands of the minhash signature, "
+        "more bands find more duplicates",
+        dest="bands",
+        default=16,
+        type=int,
+    )
+    parser.add_argument(
+        "--report", help="path where to save the json report", dest="report"
+    )
+
+    return parser.parse_args(argv)
+
+
+def cli(argv: List[str] = None):
+    args = parse_args(argv)
+    report = dedup(
+        args.input, args.output, args.near, args.partitions, args.num_perm, args.bands
+    )
+    for k, v in report.items():
+        print(k + ":", v)
+    if args.report:
+        with open(args.report, mode="w", encoding="utf8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,197 @@
+import argparse
+import time
+from itertools import islice
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+
+import utils
+from score import build_sense_map
+from sentence_loader import SentenceLoader
+
+
+class Disambiguator(object):
+    """Pick the sense of ambiguous words, comparing each sense with the context."""
+
+    def __init__(self, vectors, senses_map: Dict[str, Set[str]]):
+        """
+        :param vectors: gensim word vectors, with lemma_synset vectors.
+        :param senses_map: a dictionary from word to senses.
+        """
+        self.loader = SentenceLoader([])
+        words = vectors.index2word
+        matrix = vectors.vectors.astype(np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-8)
+        index = {word: i for i, word in enumerate(words)}
+
+        # candidate senses of each lemma, one after the other, the senses of
+        # lemma i are candidates[offsets[i] : offsets[i + 1]]. Rows are sorted,
+        # so ties go to the most frequent sense and not to the set order
+        self.lemmas, rows = {}, []
+        for lemma, synsets in senses_map.items():
+            senses = (lemma + "_" + synset for synset in synsets)
+            senses = sorted(index[sense] for sense in senses if sense in index)
+            if senses:
+                self.lemmas[lemma] = len(rows)
+                rows.append(senses)
+        self.offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in rows], out=self.offsets[1:])
+        self.candidates = np.array(
+            [sense for senses in rows for sense in senses], dtype=np.int64
+        )
+
+        # context vector of each token, lemmas not in the vocab are
+        # represented by the mean of their senses
+        extra = [w for w in self.lemmas if w not in index]
+        self.context_index = dict(index)
+        self.context_index.update((w, len(words) + i) for i, w in enumerate(extra))
+        mean_senses = [matrix[rows[self.lemmas[w]]].mean(axis=0) for w in extra]
+        self.context = np.vstack([matrix] + mean_senses) if extra else matrix
+        self.senses = matrix
+        self.words = words
+
+    def disambiguate(self, sentences: List[str]) -> List[List[str]]:
+        """
+        Disambiguate a batch of sentences.
+        :param sentences: raw sentences.
+        :return: the cleaned sentences, with each ambiguous word replaced by its sense.
+        """
+        tokens = [self.loader.complete_clean(sentence) for sentence in sentences]
+        ctx_rows, ctx_bounds = [], [0]
+        target_sent, target_pos, target_lemma, target_row = [], [], [], []
+        for i, sentence in enumerate(tokens):
+            for j, token in enumerate(sentence):
+                row = self.context_index.get(token, -1)
+                if row >= 0:
+                    ctx_rows.append(row)
+                lemma = self.lemmas.get(token)
+                if lemma is not None:
+                    target_sent.append(i)
+                    target_pos.append(j)
+                    target_lemma.append(lemma)
+                    target_row.append(row)
+            ctx_bounds.append(len(ctx_rows))
+        if not target_sent:
+            return tokens
+
+        # sum of the context vectors of each sentence, with a cumulative sum
+        cumulative = np.zeros((len(ctx_rows) + 1, self.context.shape[1]), np.float32)
+        np.cumsum(self.context[ctx_rows], axis=0, out=cumulative[1:])
+        bounds = np.array(ctx_bounds)
+        sums = cumulative[bounds[1:]] - cumulative[bounds[:-1]]
+
+        # the target word is not part of its own context
+        target_sent = np.array(target_sent)
+        target_row = np.array(target_row)
+        context = sums[target_sent]
+        own = target_row >= 0
+        context[own] -= self.context[target_row[own]]
+
+        # flat list of the candidates of every target, only the actual senses
+        # of each lemma are scored
+        target_lemma = np.array(target_lemma)
+        starts = self.offsets[target_lemma]
+        counts = self.offsets[target_lemma + 1] - starts
+        segments = np.cumsum(counts) - counts
+        owner = np.repeat(np.arange(len(counts)), counts)
+        flat = np.arange(counts.sum()) - segments[owner] + starts[owner]
+        candidates = self.candidates[flat]
+        scores = np.einsum("nd,nd->n", context[owner], self.senses[candidates])
+
+        # first candidate with the max score of each target
+        is_best = np.flatnonzero(scores == np.maximum.reduceat(scores, segments)[owner])
+        first = np.r_[True, owner[is_best[1:]] != owner[is_best[:-1]]]
+        best = candidates[is_best[first]]
+
+        for i, j, sense in zip(target_sent, target_pos, best):
+            tokens[i][j] = self.words[sense]
+        return tokens
+
+    def disambiguate_all(
+        self, sentences: Iterable[str], batch_size: int = 1000
+    ) -> Iterable[List[str]]:
+        """
+        Disambiguate a stream of sentences in batches.
+        :param sentences: raw sentences.
+        :param batch_size: number of sentences scored together.
+        :return: a generator of disambiguated sentences.
+        """
+        sentences = iter(sentences)
+        batch = list(islice(sentences, batch_size))
+        while batch:
+            yield from self.disambiguate(batch)
+            batch = list(islice(sentences, batch_size))
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(help="path to the embeddings", dest="embeddings")
+    parser.add_argument(help="path to the sentences to disambiguate", dest="input")
+    parser.add_argument(
+        "-o", help="path where to save the disambiguated sentences", dest="output"
+    )
+    parser.add_argument("--map", help="path to the word to senses map", dest="map")
+    parser.add_argument(
+        "--batch-size",
+        help="number of sentences scored together",
+        dest="batch_size",
+        default=1000,
+        type=int,
+    )
+    parser.add_argument(
+        "--benchmark",
+        help="print the throughput in tokens/sec",
+        dest="benchmark",
+        action="store_true",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(
+    embeddings: str,
+    path_input: str,
+    path_output: str = None,
+    senses_path: str = None,
+    batch_size: int = 1000,
+    benchmark: bool = False,
+):
+    from gensim.models import KeyedVectors
+
+    print("Load embeddings")
+    vectors = KeyedVectors.load_word2vec_format(embeddings, binary=False)
+    senses_map = (
+        utils.read_dictionary(senses_path) if senses_path else build_sense_map(vectors)
+    )
+    disambiguator = Disambiguator(vectors, senses_map)
+
+    n_tokens = 0
+    start = time.time()
+    with open(path_input, encoding="utf8") as file:
+        sentences = disambiguator.disambiguate_all(file, batch_size)
+        if path_output:
+            with open(path_output, mode="w", encoding="utf8") as out:
+                for sentence in sentences:
+                    n_tokens += len(sentence)
+                    out.write(" ".join(sentence) + "\n")
+        else:
+            n_tokens = sum(len(sentence) for sentence in sentences)
+    if benchmark:
+        elapsed = time.time() - start
+        print("Tokens:", n_tokens, "- Tokens/sec:", int(n_tokens / elapsed))
+
+
+def cli(argv: List[str] = None):
+    args = parse_args(argv)
+    main(
+        args.embeddings,
+        args.input,
+        args.output,
+        args.map,
+        args.batch_size,
+        args.benchmark,
+    )
+
+
+if __name__ == "__main__":
+    cli()
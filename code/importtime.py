@@ -0,0 +1,133 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+CODE_DIR = Path(__file__).resolve().parent
+
+# modules loaded by the cli entry points
+MODULES = [
+    "cli",
+    "parse",
+    "dedup",
+    "stats",
+    "train",
+    "sweep",
+    "score",
+    "disambiguate",
+    "merge",
+    "visualization",
+]
+
+
+def _importtime(module: str) -> List[Tuple[int, str]]:
+    """
+    Import a module in a fresh interpreter, with -X importtime.
+    :param module: module to import.
+    :return: the cumulative time in microseconds and the name of each import,
+    nested imports keep their indentation.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        cwd=str(CODE_DIR),
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    # import time: self [us] | cumulative | imported package
+    lines = (
+        line.split("|")
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    )
+    return [(int(cumulative), package[1:]) for _, cumulative, package in lines]
+
+
+def import_time(module: str, runs: int = 5) -> int:
+    """
+    Measure the import time of a module in a fresh interpreter, with -X importtime.
+    :param module: module to import.
+    :param runs: number of runs, the fastest one is kept.
+    :return: the cumulative import time in microseconds.
+    """
+    return min(
+        sum(
+            cumulative
+            for cumulative, package in _importtime(module)
+            # top level imports only, nested ones are in the cumulative time
+            if not package.startswith(" ")
+        )
+        for _ in range(runs)
+    )
+
+
+def imported_packages(module: str) -> Set[str]:
+    """
+    Find the top level packages loaded when importing a module.
+    :param module: module to import.
+    :return: the names of the packages.
+    """
+    return {package.strip().split(".")[0] for _, package in _importtime(module)}
+
+
+def check(times: Dict[str, int], baseline: Dict[str, int], tolerance: float) -> List[str]:
+    """
+    Compare the import times against a baseline.
+    :param times: measured import times.
+    :param baseline: reference import times.
+    :param tolerance: allowed relative slowdown.
+    :return: the modules slower than the baseline.
+    """
+    return [
+        module
+        for module, time in times.items()
+        if module in baseline and time > baseline[module] * (1 + tolerance)
+    ]
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        nargs="*", help="modules to measure", dest="modules", default=MODULES
+    )
+    parser.add_argument("--save", help="path where to save the times", dest="save")
+    parser.add_argument(
+        "--check", help="baseline to check the times against", dest="check"
+    )
+    parser.add_argument(
+        "--tolerance",
+        help="allowed relative slowdown against the baseline",
+        dest="tolerance",
+        default=0.2,
+        type=float,
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(
+    modules: List[str],
+    path_save: str = None,
+    path_check: str = None,
+    tolerance: float = 0.2,
+) -> int:
+    times = {module: import_time(module) for module in modules}
+    for module, time in times.items():
+        print("{:<15}{:>10.1f} ms".format(module, time / 1000))
+    if path_save:
+        with open(path_save, mode="w", encoding="utf8") as file:
+            json.dump(times, file, indent=2)
+    if path_check:
+        with open(path_check, encoding="utf8") as file:
+            slower = check(times, json.load(file), tolerance)
+        if slower:
+            print("Slower than baseline:", ", ".join(slower))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(main(args.modules, args.save, args.check, args.tolerance))
@@ -0,0 +1,205 @@
+import argparse
+import tempfile
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+def read_vectors(path: str, path_memmap: str) -> Tuple[np.memmap, Dict[str, int]]:
+    """
+    Copy the vectors of a word2vec text file in a memory mapped matrix on disk.
+    :param path: path to the embeddings.
+    :param path_memmap: path of the memory mapped matrix.
+    :return: the matrix and a dictionary from word to row.
+    """
+    with open(path, encoding="utf8") as file:
+        n_words, size = (int(n) for n in file.readline().split())
+        matrix = np.memmap(
+            path_memmap, dtype=np.float32, mode="w+", shape=(n_words, size)
+        )
+        index = {}
+        for i, line in enumerate(file):
+            word, *vector = line.rstrip().split(" ")
+            index[word] = i
+            matrix[i] = np.array(vector, dtype=np.float32)
+    matrix.flush()
+    return matrix, index
+
+
+def anchors(indexes: List[Dict[str, int]], n_anchors: int = None) -> List[str]:
+    """
+    Compute the words shared by every model.
+    :param indexes: dictionaries from word to row, the first is the reference.
+    :param n_anchors: max number of anchors, the most frequent ones are kept.
+    :return: the list of shared words.
+    """
+    # word2vec files are sorted by frequency
+    shared = (w for w in indexes[0] if all(w in index for index in indexes[1:]))
+    return list(islice(shared, n_anchors))
+
+
+def procrustes(cross: np.ndarray) -> np.ndarray:
+    """
+    Solve the orthogonal Procrustes problem, min ||source W - target||
+    with W orthogonal.
+    :param cross: the d x d matrix source.T @ target, of the anchor vectors of
+    the model to align and of the reference model.
+    :return: the orthogonal matrix W.
+    """
+    u, _, vt = np.linalg.svd(cross)
+    return u @ vt
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-8)
+
+
+def merge(
+    paths: List[str],
+    path_output: str,
+    mode: str = "average",
+    n_anchors: int = None,
+    chunk_size: int = 10000,
+):
+    """
+    Align the embeddings to the first one and merge them in a single file.
+    :param paths: paths to the embeddings, the first one is the reference.
+    :param path_output: path where to save the merged embeddings.
+    :param mode: average=mean of the aligned vectors of each word, all the words
+    are kept; concat=aligned vectors one after the other, shared words only.
+    :param n_anchors: max number of shared words used to align the models.
+    :param chunk_size: number of words aligned and merged at a time.
+    :return:
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        print("Load embeddings")
+        models = [
+            read_vectors(path, str(Path(tmp) / (str(i) + ".mmap")))
+            for i, path in enumerate(paths)
+        ]
+        if len(set(matrix.shape[1] for matrix, _ in models)) > 1:
+            raise ValueError("Embeddings must have the same dimensionality")
+        indexes = [index for _, index in models]
+        shared = anchors(indexes, n_anchors)
+        print("Anchors:", len(shared))
+        size = models[0][0].shape[1]
+        # with fewer anchors than dimensions the rotation is underdetermined
+        if len(shared) < size:
+            raise ValueError(
+                "Not enough shared words to align the embeddings: "
+                "{} anchors, {} dimensions".format(len(shared), size)
+            )
+
+        # only the d x d products of the anchors are kept in memory
+        crosses = [np.zeros((size, size), dtype=np.float64) for _ in models[1:]]
+        for start in range(0, len(shared), chunk_size):
+            chunk = shared[start : start + chunk_size]
+            reference = _normalize(models[0][0][[indexes[0][w] for w in chunk]])
+            for cross, (matrix, index) in zip(crosses, models[1:]):
+                source = _normalize(matrix[[index[w] for w in chunk]])
+                cross += source.T @ reference
+        rotations = [np.eye(size, dtype=np.float32)]
+        rotations.extend(procrustes(cross).astype(np.float32) for cross in crosses)
+
+        if mode == "concat":
+            words = anchors(indexes)
+            size = sum(matrix.shape[1] for matrix, _ in models)
+        else:
+            words = list(indexes[0])
+            seen = set(words)
+            for index in indexes[1:]:
+                words.extend(w for w in index if w not in seen)
+                seen.update(index)
+            size = models[0][0].shape[1]
+
+        print("Writing", len(words), "vectors")
+        with open(path_output, mode="w", encoding="utf8") as out:
+            out.write(str(len(words)) + " " + str(size) + "\n")
+            for start in range(0, len(words), chunk_size):
+                chunk = words[start : start + chunk_size]
+                vectors = _merge_chunk(chunk, models, rotations, mode)
+                out.writelines(
+                    word + " " + " ".join(str(v) for v in vector) + "\n"
+                    for word, vector in zip(chunk, vectors)
+                )
+
+
+def _merge_chunk(
+    words: List[str],
+    models: List[Tuple[np.memmap, Dict[str, int]]],
+    rotations: List[np.ndarray],
+    mode: str,
+) -> np.ndarray:
+    """
+    Align and merge the vectors of a chunk of words.
+    :param words: words to merge.
+    :param models: memory mapped matrices and their word to row dictionaries.
+    :param rotations: orthogonal matrix of each model.
+    :param mode: average or concat.
+    :return: the merged vectors.
+    """
+    if mode == "concat":
+        return np.hstack(
+            [
+                matrix[[index[w] for w in words]] @ rotation
+                for (matrix, index), rotation in zip(models, rotations)
+            ]
+        )
+    total = np.zeros((len(words), rotations[0].shape[1]), dtype=np.float32)
+    counts = np.zeros((len(words), 1), dtype=np.float32)
+    for (matrix, index), rotation in zip(models, rotations):
+        rows = [i for i, w in enumerate(words) if w in index]
+        if rows:
+            total[rows] += matrix[[index[words[i]] for i in rows]] @ rotation
+            counts[rows] += 1
+    return total / counts
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        nargs="+",
+        help="paths to the embeddings, the first one is the reference",
+        dest="input",
+    )
+    parser.add_argument(
+        "-o",
+        help="path where to save the merged embeddings",
+        required=True,
+        dest="output",
+    )
+    parser.add_argument(
+        "--mode",
+        help="average=mean of the aligned vectors, "
+        "concat=concatenation of the aligned vectors",
+        dest="mode",
+        choices=("average", "concat"),
+        default="average",
+    )
+    parser.add_argument(
+        "--anchors",
+        help="max number of shared words used to align the embeddings, "
+        "at least the number of dimensions",
+        dest="anchors",
+        type=int,
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="number of words aligned and merged at a time",
+        dest="chunk_size",
+        default=10000,
+        type=int,
+    )
+
+    return parser.parse_args(argv)
+
+
+def cli(argv: List[str] = None):
+    args = parse_args(argv)
+    merge(args.input, args.output, args.mode, args.anchors, args.chunk_size)
+
+
+if __name__ == "__main__":
+    cli()
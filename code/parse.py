@@ -3,40 +3,65 @@ from typing import List
 
 import constants as const
 import utils
-from preprocess import eurosense, sew
 
 
-def parse_es(path_input: str, path_output: str, check_synset: bool = False):
+def parse_es(
+    path_input: str,
+    path_output: str,
+    check_synset: bool = False,
+    langs: List[str] = None,
+):
     """
-    Parse EuroSense in a single txt file.
+    Parse EuroSense in a single txt file, or in one txt file for each language.
     :param path_input: raw EuroSense path.
     :param path_output: where to save the parsed file.
     :param check_synset: if True, check if the synset is correct for the given lemma.
+    :param langs: languages to parse, the language is appended to the output file.
     :return:
     """
-    eurosense.main(path_input, path_output, check_synset)
+    from preprocess import eurosense
+
+    eurosense.main(path_input, path_output, check_synset, langs)
+
+
+def filter_es(path_input: str, path_output: str, langs: List[str]):
+    """
+    Filter EuroSense in one xml file for each language, in a single pass.
+    :param path_input: raw EuroSense path.
+    :param path_output: base path of the filtered files, the language is appended.
+    :param langs: languages to keep.
+    :return:
+    """
+    from preprocess import eurosense
+
+    eurosense.filter_eurosense_stream(path_input, utils.lang_paths(path_output, langs))
 
 
 def parse_sew(path_input: str, path_output: str):
+    from preprocess import sew
+
     sew.main(path_input, path_output)
 
 
-def make_dict(paths: List[str], path_dict: str):
+def make_dict(paths: List[str], path_dict: str, jobs: int = 1):
     """
     Write a dictionary from word to senses, from the given input files.
     :param paths: files to read.
     :param path_dict: where to save the dictionary.
+    :param jobs: number of processes.
     :return:
     """
     bnwn_map = utils.read_dictionary(const.BN2WN_MAP)
-    word_synset_map = utils.compute_word_sysnet_map(paths, bnwn_map)
+    word_synset_map = utils.compute_word_sysnet_map(paths, bnwn_map, jobs)
     utils.write_dictionary(path_dict, word_synset_map)
 
 
-def parse_args():
+def parse_args(argv: List[str] = None):
     parser = argparse.ArgumentParser()
     parser.add_argument(
-        help="corpus name to parse, es=EruoSense, sew=SEW", dest="corpus"
+        help="corpus name to parse, es=EruoSense, sew=SEW, "
+        "filter=filter EuroSense by language, dict=word to senses dictionary",
+        dest="corpus",
     )
     parser.add_argument("-i", help="path of the corpus", required=True, dest="input")
     parser.add_argument(
@@ -48,16 +73,37 @@ def parse_args():
         dest="check_synset",
         action="store_true",
     )
+    parser.add_argument(
+        "--langs",
+        help="comma separated languages to parse, works with EuroSense only.",
+        dest="langs",
+        type=lambda langs: langs.split(","),
+    )
+    parser.add_argument(
+        "--jobs",
+        help="number of parallel processes, works with dict only.",
+        dest="jobs",
+        default=1,
+        type=int,
+    )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-if __name__ == "__main__":
-    args = parse_args()
+def cli(argv: List[str] = None):
+    args = parse_args(argv)
     print(args.check_synset)
     if args.corpus == "es":
-        parse_es(args.input, args.output, args.check_synset)
+        parse_es(args.input, args.output, args.check_synset, args.langs)
+    elif args.corpus == "filter":
+        filter_es(args.input, args.output, args.langs or ["en"])
     elif args.corpus == "sew":
         parse_sew(args.input, args.output)
+    elif args.corpus == "dict":
+        make_dict([args.input], args.output, args.jobs)
     else:
         print("Option not available")
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,5 +1,6 @@
+from contextlib import ExitStack
 from copy import deepcopy
-from typing import Dict
+from typing import Dict, List
 
 from lxml import etree
 from nltk.corpus import wordnet as wn
@@ -18,10 +19,7 @@ def fast_iter(parser, func):
     """
     for event, elem in tqdm(parser):
         func(elem)
-        elem.clear()
-        # eliminate now-empty references from the root node
-        while elem.getprevious() is not None:
-            del elem.getparent()[0]
+        _release(elem)
     del parser
 
 
@@ -50,6 +48,69 @@ def filter_eurosense(path: str, out_path: str, lang="en"):
         out.write("</corpus>")
 
 
+def filter_eurosense_stream(path: str, out_paths: Dict[str, str]):
+    """
+    Parse the xml file and writes, in a single pass, one xml file for each language.
+    Nodes are streamed to the output files, without copying or building new trees.
+    :param path: path of the xml file.
+    :param out_paths: dictionary from language to the path of its new xml file.
+    :return:
+    """
+    with ExitStack() as stack:
+        writers = {}
+        for lang, out_path in out_paths.items():
+            writer = stack.enter_context(etree.xmlfile(out_path, encoding="utf-8"))
+            writer.write_declaration()
+            stack.enter_context(writer.element("corpus", source="europarl"))
+            writer.write("\n")
+            writers[lang] = writer
+
+        parser = etree.iterparse(
+            path, events=("end",), tag="sentence", remove_blank_text=True
+        )
+        for _, elem in tqdm(parser):
+            for lang, writer in writers.items():
+                _write_node(writer, elem, lang)
+            _release(elem)
+        del parser
+
+
+def _write_node(writer: etree.xmlfile, elem: etree.Element, lang="en"):
+    """
+    Write a sentence node with only the selected language.
+    :param writer: incremental xml writer.
+    :param elem: node to filter.
+    :param lang: language to keep.
+    :return:
+    """
+    text = elem.find('text[@lang="{}"]'.format(lang))
+    # skip sentences not translated in the given language
+    if text is None:
+        return
+    with writer.element("sentence", id=elem.attrib["id"]):
+        writer.write(text, with_tail=False)
+        with writer.element("annotations"):
+            for annotation in elem.iterfind(
+                'annotations/annotation[@lang="{}"]'.format(lang)
+            ):
+                writer.write(annotation, with_tail=False)
+    writer.write("\n")
+
+
+def _release(elem: etree.Element):
+    """
+    Remove from memory the given node and the nodes already seen.
+    :param elem: last parsed node.
+    :return:
+    """
+    # tails are already dropped by remove_blank_text
+    elem.clear()
+    parent = elem.getparent()
+    # everything before the current node has already been processed
+    if parent is not None:
+        del parent[:-1]
+
+
 def _filter_node(elem: etree.Element, lang="en") -> str:
     """
     Create a new node tree with only the selected language.
@@ -94,22 +155,64 @@ def write_sentences(
         )
 
 
+def write_sentences_multi(
+    path: str,
+    out_paths: Dict[str, str],
+    bn_wn_map: Dict[str, str],
+    check_synset: bool = False,
+):
+    """
+    Produce a file of sentences with senses for each language, in a single pass.
+    :param path: path of input file.
+    :param out_paths: dictionary from language to the path of its output file.
+    :param bn_wn_map: mapping file from bn synsets to wn.
+    :param check_synset: chek if synset is correct, applied to english only.
+    :return:
+    """
+    with ExitStack() as stack:
+        outs = {
+            lang: stack.enter_context(open(out_path, mode="w", encoding="utf-8"))
+            for lang, out_path in out_paths.items()
+        }
+        parser = etree.iterparse(
+            path, events=("end",), tag="sentence", remove_blank_text=True
+        )
+
+        def write_langs(elem: etree.Element):
+            for lang, out in outs.items():
+                text = _extract_annotations(
+                    elem, bn_wn_map, check_synset and lang == "en", lang
+                )
+                out.write(text + "\n")
+
+        fast_iter(parser, write_langs)
+
+
 def _extract_annotations(
-    elem: etree.Element, bn_wn_map: Dict[str, str], check_synset: bool = False
+    elem: etree.Element,
+    bn_wn_map: Dict[str, str],
+    check_synset: bool = False,
+    lang: str = None,
 ) -> str:
     """
     Extract annotatiions and replace words with senses.
     :param elem: node of the tree.
     :param bn_wn_map: mapping file from bn synsets to wn.
     :param check_synset:
+    :param lang: language of text and annotations, if None the first text is used.
     :return: the string with words replaced with sense
     """
-    text = elem.xpath("//text")[0].text
+    if lang:
+        text = elem.findtext('text[@lang="{}"]'.format(lang))
+        annotations = elem.iterfind('annotations/annotation[@lang="{}"]'.format(lang))
+    else:
+        text = elem.findtext("text")
+        annotations = elem.iter("annotation")
     # if not text, return empty string
     if not text:
         return ""
 
-    for annotation in elem.xpath(".//annotation"):
+    for annotation in annotations:
         if _is_valid_synset(annotation, bn_wn_map, check_synset):
             text = _replace_sense(annotation, text)
 
@@ -162,9 +265,19 @@ def _is_valid_synset(
         return True
 
 
-def main(path_input: str, path_output: str, check_synset: bool = False):
+def main(
+    path_input: str,
+    path_output: str,
+    check_synset: bool = False,
+    langs: List[str] = None,
+):
     # read bn to wn mapping file
     bnwn_map = utils.read_dictionary(const.BN2WN_MAP)
     # write a file with only sentences, each annotated word is replaced with the sense
-    write_sentences(path_input, path_output, bnwn_map, check_synset)
+    if langs:
+        write_sentences_multi(
+            path_input, utils.lang_paths(path_output, langs), bnwn_map, check_synset
+        )
+    else:
+        write_sentences(path_input, path_output, bnwn_map, check_synset)
     # compute a dictionary -> senses
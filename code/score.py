@@ -2,9 +2,6 @@ import argparse
 from collections import defaultdict
 from typing import Dict, List
 
-from gensim.models import KeyedVectors
-from scipy.stats import spearmanr
-
 import utils
 
 
@@ -17,7 +14,7 @@ def get_gold_score(path: str) -> Dict:
     with open(path) as file:
         next(file)
         tokens = (l.strip().split() for l in file)
-        return {(w1.lower(), w2.lower()): score for w1, w2, score in tokens}
+        return {(w1.lower(), w2.lower()): float(score) for w1, w2, score in tokens}
 
 
 def compute_cosine(w1: str, w2: str, embeddings, senses_dict: Dict) -> float:
@@ -88,16 +85,26 @@ def build_sense_map(embeddings):
     return senses_dict
 
 
-def parse_args():
+def parse_args(argv: List[str] = None):
     parser = argparse.ArgumentParser()
     parser.add_argument(help="path to the embeddings", dest="input")
     parser.add_argument(help="path to the test file", dest="test")
     parser.add_argument("--map", help="path to the word to senses map", dest="map")
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main(embeddings: str, test_path: str, senses_path: str):
+def evaluate(embeddings: str, test_path: str, senses_path: str = None):
+    """
+    Compute the Spearman correlation between gold and predicted scores.
+    :param embeddings: path to the embeddings vector file.
+    :param test_path: path to the test file.
+    :param senses_path: path to the word to senses map, if None it is built from the embeddings.
+    :return: the Spearman correlation result.
+    """
+    from gensim.models import KeyedVectors
+    from scipy.stats import spearmanr
+
     print("Load embeddings")
     vectors = KeyedVectors.load_word2vec_format(embeddings, binary=False)
     print("Load word -> synsets dict")
@@ -109,9 +116,17 @@ def main(embeddings: str, test_path: str, senses_path: str):
     filtered_gold = filter_missing(dict_gold, senses_map)
     print("Missing words:", len(dict_gold.keys()) - len(filtered_gold.keys()))
     scores_gold, scores_predicted = compute_score(dict_gold, senses_map, vectors)
-    print(spearmanr(scores_gold, scores_predicted))
+    return spearmanr(scores_gold, scores_predicted)
 
 
-if __name__ == "__main__":
-    args = parse_args()
+def main(embeddings: str, test_path: str, senses_path: str):
+    print(evaluate(embeddings, test_path, senses_path))
+
+
+def cli(argv: List[str] = None):
+    args = parse_args(argv)
     main(args.input, args.test, args.map)
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,27 +1,123 @@
+import os
 import re
 import string
-from typing import List
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Tuple
 
-from nltk.corpus import stopwords
+
+def build_line_index(filename: str) -> array:
+    """
+    Compute the byte offset of the start of each line. The index is cached
+    in filename.idx, when possible, and rebuilt only if the file is newer.
+    :param filename: file to index.
+    :return: an array of offsets.
+    """
+    path_index = str(filename) + ".idx"
+    index = array("Q")
+    if (
+        os.path.exists(path_index)
+        and os.path.getmtime(path_index) >= os.path.getmtime(filename)
+    ):
+        with open(path_index, mode="rb") as file:
+            index.frombytes(file.read())
+        return index
+
+    offset = 0
+    with open(filename, mode="rb") as file:
+        for line in file:
+            index.append(offset)
+            offset += len(line)
+    # the index is kept in memory only if the folder is not writable
+    try:
+        with open(path_index + ".tmp", mode="wb") as file:
+            index.tofile(file)
+        os.replace(path_index + ".tmp", path_index)
+    except OSError:
+        pass
+    return index
+
+
+def split_ranges(filename: str, n_split: int) -> List[Tuple[str, int, int]]:
+    """
+    Split a file in byte ranges of about the same size, aligned to line boundaries.
+    :param filename: file to split.
+    :param n_split: number of ranges.
+    :return: a list of (filename, start, end), to be read with SentenceLoader.
+    """
+    index = build_line_index(filename)
+    size = os.path.getsize(filename)
+    bounds = [0]
+    for i in range(1, n_split):
+        line = bisect_left(index, size * i // n_split)
+        bounds.append(index[line] if line < len(index) else size)
+    bounds.append(size)
+    return [
+        (str(filename), start, end)
+        for start, end in zip(bounds[:-1], bounds[1:])
+        if start < end
+    ]
 
 
 class SentenceLoader(object):
-    """Iterate over a sentence file from disk."""
+    """
+    Iterate over a sentence file from disk. Each element of filenames is either
+    a path or a (path, start, end) byte range, see split_ranges. Ranges are
+    aligned to line boundaries: a line belongs to the range of its first byte.
+    """
+
+    def __init__(self, filenames, complete: bool = True, cleaned: bool = False):
+        from nltk.corpus import stopwords
 
-    def __init__(self, filenames, complete: bool = True):
         self.filenames = filenames
         self.stop = set(stopwords.words("english")) | set(string.punctuation)
         self.html_regex = re.compile(r"&\w+;")
         self.complete = complete
+        self.cleaned = cleaned
 
     def __iter__(self):
         for filename in self.filenames:
+            for line in self.read_lines(filename):
+                if self.cleaned:
+                    yield line.split()
+                elif self.complete:
+                    yield self.complete_clean(line)
+                else:
+                    yield self.naive_clean(line)
+
+    @staticmethod
+    def read_lines(filename) -> Iterable[str]:
+        """
+        Read the lines of a file, or of a byte range of a file.
+        :param filename: a path or a (path, start, end) byte range.
+        :return: a generator of lines.
+        """
+        if not isinstance(filename, tuple):
             with open(filename, mode="r", encoding="utf8") as file:
-                for line in file:
-                    if self.complete:
-                        yield self.complete_clean(line)
-                    else:
-                        self.naive_clean(line)
+                yield from file
+            return
+
+        filename, start, end = filename
+        with open(filename, mode="rb") as file:
+            # skip the line started in the previous range
+            if start > 0:
+                file.seek(start - 1)
+                start += len(file.readline()) - 1
+            position = start
+            for line in file:
+                if position >= end:
+                    break
+                position += len(line)
+                yield line.decode("utf8")
+
+    def save(self, filename: str):
+        """
+        Writes the cleaned sentences in a file, to be read back with cleaned=True.
+        :param filename: path where to save the cleaned sentences.
+        :return:
+        """
+        with open(filename, mode="w", encoding="utf8") as file:
+            file.writelines(" ".join(sentence) + "\n" for sentence in self)
 
     def naive_clean(self, line: str) -> List[str]:
         """
@@ -0,0 +1,115 @@
+import hashlib
+from typing import List
+
+import numpy as np
+
+
+def hash_tokens(tokens: List[str]) -> np.ndarray:
+    """
+    Compute a 64 bit hash for each token, stable across processes.
+    :param tokens: strings to hash.
+    :return: an array of unsigned 64 bit hashes.
+    """
+    return np.fromiter(
+        (
+            int.from_bytes(
+                hashlib.blake2b(token.encode("utf8"), digest_size=8).digest(), "little"
+            )
+            for token in tokens
+        ),
+        dtype=np.uint64,
+        count=len(tokens),
+    )
+
+
+class CountMinSketch(object):
+    """Approximate frequency counter, it never underestimates a count."""
+
+    def __init__(self, width: int = 2 ** 20, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self.total = 0
+
+    def _indexes(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Compute the column of each hash for every row, using double hashing.
+        :param hashes: 64 bit hashes.
+        :return: a matrix depth x len(hashes) of columns.
+        """
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = hashes >> np.uint64(32)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return (low[None, :] + rows * high[None, :]) % np.uint64(self.width)
+
+    def update(self, hashes: np.ndarray):
+        """
+        Count the given hashes.
+        :param hashes: 64 bit hashes, see hash_tokens.
+        :return:
+        """
+        for row, columns in enumerate(self._indexes(hashes)):
+            np.add.at(self.table[row], columns, 1)
+        self.total += len(hashes)
+
+    def query(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Estimate the frequency of the given hashes.
+        :param hashes: 64 bit hashes, see hash_tokens.
+        :return: the estimated counts.
+        """
+        columns = self._indexes(hashes)
+        return np.min(self.table[np.arange(self.depth)[:, None], columns], axis=0)
+
+    def merge(self, other: "CountMinSketch"):
+        """
+        Add the counts of another sketch with the same shape.
+        :param other: sketch to merge.
+        :return:
+        """
+        self.table += other.table
+        self.total += other.total
+
+
+class HyperLogLog(object):
+    """Approximate counter of distinct elements."""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.registers = np.zeros(2 ** p, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        """
+        Add the given hashes to the set.
+        :param hashes: 64 bit hashes, see hash_tokens.
+        :return:
+        """
+        bits = 64 - self.p
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # position of the leftmost 1 in the remaining bits
+        _, length = np.frexp(rest.astype(np.float64))
+        rank = (bits - length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct elements.
+        :return: the cardinality estimate.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+        zeros = np.count_nonzero(self.registers == 0)
+        # small range correction
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog"):
+        """
+        Union with another counter with the same precision.
+        :param other: counter to merge.
+        :return:
+        """
+        np.maximum(self.registers, other.registers, out=self.registers)
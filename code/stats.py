@@ -0,0 +1,278 @@
+import argparse
+import json
+import multiprocessing
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from sentence_loader import SentenceLoader, split_ranges
+from sketch import CountMinSketch, HyperLogLog, hash_tokens
+
+
+class CorpusStats(object):
+    """Streaming statistics of a parsed corpus."""
+
+    def __init__(
+        self, width: int = 2 ** 20, depth: int = 4, p: int = 14, top_k: int = 1000
+    ):
+        self.words = CountMinSketch(width, depth)
+        self.vocab = HyperLogLog(p)
+        self.senses = Counter()
+        self.top_k = top_k
+        self.top_words = {}
+        self.sentences = 0
+        self.tokens = 0
+        self._buffer = []
+
+    def update(self, tokens: List[str]):
+        """
+        Add a cleaned sentence to the statistics.
+        :param tokens: tokens of the sentence.
+        :return:
+        """
+        self.sentences += 1
+        self.tokens += len(tokens)
+        self.senses.update(token for token in tokens if "_bn:" in token)
+        self._buffer.extend(tokens)
+        if len(self._buffer) >= 100000:
+            self.flush()
+
+    def flush(self):
+        """
+        Update the sketches with the buffered tokens.
+        :return:
+        """
+        if not self._buffer:
+            return
+        hashes = hash_tokens(self._buffer)
+        self.words.update(hashes)
+        self.vocab.update(hashes)
+        self._update_top(self._buffer, hashes)
+        self._buffer = []
+
+    def _update_top(self, tokens: List[str], hashes: np.ndarray):
+        """
+        Keep track of the most frequent words, using the count-min sketch estimates.
+        :param tokens: candidate words.
+        :param hashes: hashes of the candidate words.
+        :return:
+        """
+        for token, count in zip(tokens, self.words.query(hashes)):
+            self.top_words[token] = int(count)
+        if len(self.top_words) > 2 * self.top_k:
+            self.top_words = dict(
+                Counter(self.top_words).most_common(self.top_k)
+            )
+
+    def merge(self, other: "CorpusStats"):
+        """
+        Merge the statistics of another shard.
+        :param other: statistics to merge.
+        :return:
+        """
+        self.flush()
+        other.flush()
+        self.words.merge(other.words)
+        self.vocab.merge(other.vocab)
+        self.senses.update(other.senses)
+        self.sentences += other.sentences
+        self.tokens += other.tokens
+        # estimates must be refreshed against the merged sketch
+        candidates = list(set(self.top_words) | set(other.top_words))
+        self.top_words = {}
+        if candidates:
+            self._update_top(candidates, hash_tokens(candidates))
+
+    def report(self, coverage: float = 0.95, keep: float = 0.5) -> Dict:
+        """
+        Summarize the statistics.
+        :param coverage: fraction of sense occurrences to keep when suggesting min_count.
+        :param keep: min fraction of distinct senses to keep when suggesting min_count.
+        :return: a dictionary with the report.
+        """
+        suggested = suggest_min_count(self.senses, coverage, keep)
+        self.flush()
+        sense_tokens = sum(self.senses.values())
+        lemma_senses = defaultdict(int)
+        for sense in self.senses:
+            lemma_senses[sense.rpartition("_")[0]] += 1
+        ambiguity = Counter(lemma_senses.values())
+        top_words = Counter(self.top_words).most_common(self.top_k)
+        return {
+            "sentences": self.sentences,
+            "tokens": self.tokens,
+            "sense_tokens": sense_tokens,
+            "annotation_density": sense_tokens / self.tokens if self.tokens else 0.0,
+            "distinct_words_estimate": self.vocab.count(),
+            "distinct_senses": len(self.senses),
+            "distinct_lemmas": len(lemma_senses),
+            "mean_senses_per_lemma": (
+                len(self.senses) / len(lemma_senses) if lemma_senses else 0.0
+            ),
+            "lemma_ambiguity": {str(k): ambiguity[k] for k in sorted(ambiguity)},
+            "senses_min_count": {
+                str(m): sum(1 for c in self.senses.values() if c >= m)
+                for m in (1, 2, 3, 5, 10, 20, 50, 100)
+            },
+            "subsampled_words": {
+                str(s): sum(1 for _, c in top_words if c / self.tokens > s)
+                for s in (1e-3, 1e-4, 1e-5)
+            }
+            if self.tokens
+            else {},
+            "top_words": top_words[:100],
+            "coverage": coverage,
+            "keep": keep,
+            "suggested_min_count": suggested,
+            "suggested_senses_kept": sum(
+                1 for c in self.senses.values() if c >= suggested
+            ),
+        }
+
+
+def suggest_min_count(
+    senses: Counter, coverage: float = 0.95, keep: float = 0.5
+) -> int:
+    """
+    Compute the largest min_count for senses such that the kept senses still
+    cover the given fraction of the sense occurrences, and are at least the
+    given fraction of the distinct senses.
+    :param senses: counts of each sense.
+    :param coverage: fraction of sense occurrences to keep.
+    :param keep: min fraction of distinct senses to keep.
+    :return: the suggested min_count.
+    """
+    counts = sorted(senses.values(), reverse=True)
+    if not counts:
+        return 1
+    total = sum(counts)
+    kept = 0
+    for count in counts:
+        kept += count
+        if kept >= coverage * total:
+            break
+    # on skewed distributions the coverage alone can drop most of the senses
+    n_keep = max(int(len(counts) * keep), 1)
+    return max(min(count, counts[n_keep - 1]), 1)
+
+
+def shard_stats(
+    shard: Tuple[str, int, int], width: int, depth: int, p: int
+) -> CorpusStats:
+    """
+    Compute the statistics of a single shard.
+    :param shard: byte range of a parsed corpus file, see split_ranges.
+    :param width: width of the count-min sketch.
+    :param depth: depth of the count-min sketch.
+    :param p: precision of the hyperloglog.
+    :return: the statistics of the shard.
+    """
+    stats = CorpusStats(width, depth, p)
+    for tokens in SentenceLoader([shard]):
+        stats.update(tokens)
+    stats.flush()
+    return stats
+
+
+def _shard_stats(args) -> CorpusStats:
+    return shard_stats(*args)
+
+
+def compute_stats(
+    paths: List[str],
+    jobs: int = multiprocessing.cpu_count(),
+    width: int = 2 ** 20,
+    depth: int = 4,
+    p: int = 14,
+) -> CorpusStats:
+    """
+    Compute the statistics of the given files in parallel, each file is split in
+    jobs byte ranges without copying it.
+    :param paths: parsed corpus files.
+    :param jobs: number of processes.
+    :param width: width of the count-min sketch.
+    :param depth: depth of the count-min sketch.
+    :param p: precision of the hyperloglog.
+    :return: the merged statistics.
+    """
+    ranges = [shard for path in paths for shard in split_ranges(path, jobs)]
+    args = ((r, width, depth, p) for r in ranges)
+    stats = CorpusStats(width, depth, p)
+    # empty files have no ranges
+    if not ranges:
+        return stats
+    with multiprocessing.Pool(min(jobs, len(ranges))) as pool:
+        # each shard is merged as soon as it is done, to keep few of them in memory
+        for shard in pool.imap_unordered(_shard_stats, args):
+            stats.merge(shard)
+    return stats
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(nargs="+", help="paths to the parsed corpora", dest="input")
+    parser.add_argument(
+        "-o", help="path where to save the json report", required=True, dest="output"
+    )
+    parser.add_argument(
+        "--senses", help="path where to save the sense counts", dest="senses"
+    )
+    parser.add_argument(
+        "--coverage",
+        help="fraction of sense occurrences to keep when suggesting min_count",
+        dest="coverage",
+        default=0.95,
+        type=float,
+    )
+    parser.add_argument(
+        "--keep",
+        help="min fraction of distinct senses to keep when suggesting min_count",
+        dest="keep",
+        default=0.5,
+        type=float,
+    )
+    parser.add_argument(
+        "--jobs",
+        help="number of parallel processes",
+        dest="jobs",
+        default=multiprocessing.cpu_count(),
+        type=int,
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(
+    paths: List[str],
+    path_report: str,
+    path_senses: str = None,
+    coverage: float = 0.95,
+    jobs: int = multiprocessing.cpu_count(),
+    keep: float = 0.5,
+):
+    stats = compute_stats(paths, jobs)
+    report = stats.report(coverage, keep)
+    with open(path_report, mode="w", encoding="utf8") as file:
+        json.dump(report, file, indent=2)
+    if path_senses:
+        with open(path_senses, mode="w", encoding="utf8") as file:
+            for sense, count in stats.senses.most_common():
+                file.write(sense + "\t" + str(count) + "\n")
+    print(
+        "Suggested min_count for senses:",
+        report["suggested_min_count"],
+        "- senses kept:",
+        report["suggested_senses_kept"],
+        "of",
+        report["distinct_senses"],
+    )
+
+
+def cli(argv: List[str] = None):
+    args = parse_args(argv)
+    main(args.input, args.output, args.senses, args.coverage, args.jobs, args.keep)
+
+
+if __name__ == "__main__":
+    cli()
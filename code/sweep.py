@@ -0,0 +1,219 @@
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import score
+import train
+from sentence_loader import SentenceLoader
+
+# train.main parameters that can be swept
+PARAMS = (
+    "model_type",
+    "size",
+    "iter",
+    "min_count",
+    "window",
+    "hs",
+    "negative",
+    "sense_only",
+    "min_count_senses",
+    "max_words",
+)
+
+
+def read_grid(path: str) -> Dict[str, List]:
+    """
+    Read the grid of hyperparameters, from a yaml or json file.
+    :param path: path to the grid file.
+    :return: a dictionary parameter -> list of values.
+    """
+    with open(path, encoding="utf8") as file:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+
+            grid = yaml.safe_load(file)
+        else:
+            grid = json.load(file)
+    unknown = set(grid) - set(PARAMS)
+    if unknown:
+        raise ValueError("Unknown parameters: " + ", ".join(sorted(unknown)))
+    return {k: v if isinstance(v, list) else [v] for k, v in grid.items()}
+
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """
+    Compute every combination of the hyperparameters.
+    :param grid: a dictionary parameter -> list of values.
+    :return: a list of configurations, without the ones with no output layer.
+    """
+    keys = sorted(grid)
+    configs = (
+        dict(zip(keys, values))
+        for values in itertools.product(*(grid[k] for k in keys))
+    )
+    return [c for c in configs if c.get("hs", 1) or c.get("negative", 5)]
+
+
+def run_job(
+    config: Dict,
+    corpus: str,
+    out_dir: str,
+    test_path: str,
+    senses_path: str,
+    workers: int,
+) -> Dict:
+    """
+    Train and evaluate a single configuration.
+    :param config: hyperparameters of the job.
+    :param corpus: path to the cleaned corpus.
+    :param out_dir: where to save the embeddings.
+    :param test_path: path to the test file.
+    :param senses_path: path to the word to senses map.
+    :param workers: number of worker threads of the job.
+    :return: the configuration with the embeddings path and the score.
+    """
+    name = "_".join(k + "-" + str(config[k]) for k in sorted(config))
+    save_embeddings = str(Path(out_dir) / (name + ".vec"))
+    params = dict(config)
+    params.setdefault("model_type", "w2v")
+    # a failing job must not stop the sweep, the error goes in the leaderboard
+    try:
+        train.main(
+            sentences=[corpus],
+            save_embeddings=save_embeddings,
+            workers=workers,
+            cleaned=True,
+            **params
+        )
+        # in the default mode, the senses are saved in the clean file
+        if not config.get("sense_only"):
+            file, _, ext = save_embeddings.rpartition(".")
+            save_embeddings = file + "_clean." + ext
+        result = score.evaluate(save_embeddings, test_path, senses_path)
+        correlation = result.correlation
+    except Exception as e:
+        print("Job", name, "failed:", repr(e))
+        return {
+            "score": float("nan"),
+            "embeddings": None,
+            "config": config,
+            "error": repr(e),
+        }
+    return {"score": correlation, "embeddings": save_embeddings, "config": config}
+
+
+def _run_job(args) -> Dict:
+    return run_job(*args)
+
+
+def write_leaderboard(path: str, results: List[Dict]):
+    """
+    Writes the results sorted by score.
+    :param path: path where to save the leaderboard.
+    :param results: results of the jobs.
+    :return:
+    """
+    with open(path, mode="w", encoding="utf8") as file:
+        file.write("rank\tscore\tconfig\tembeddings\terror\n")
+        for rank, result in enumerate(results, 1):
+            file.write(
+                "{}\t{:.4f}\t{}\t{}\t{}\n".format(
+                    rank,
+                    result["score"],
+                    json.dumps(result["config"], sort_keys=True),
+                    result["embeddings"] or "",
+                    result.get("error", ""),
+                )
+            )
+
+
+def corpus_key(paths: List[str]) -> str:
+    """
+    Compute a key of the corpora from their paths, sizes and modification times,
+    to detect a stale cleaned corpus.
+    :param paths: paths to the corpora.
+    :return: the hex digest of the key.
+    """
+    key = [
+        (str(Path(path).resolve()), os.stat(path).st_size, os.stat(path).st_mtime_ns)
+        for path in paths
+    ]
+    return hashlib.blake2b(json.dumps(key).encode("utf8"), digest_size=8).hexdigest()
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(nargs="+", help="paths to the corpora", dest="input")
+    parser.add_argument(
+        "-g", help="path to the yaml or json grid", required=True, dest="grid"
+    )
+    parser.add_argument(
+        "-o", help="folder where to save the embeddings", required=True, dest="output"
+    )
+    parser.add_argument(
+        "-t", help="path to the test file", required=True, dest="test"
+    )
+    parser.add_argument("--map", help="path to the word to senses map", dest="map")
+    parser.add_argument(
+        "--jobs",
+        help="number of jobs to run in parallel, cores are split among them",
+        dest="jobs",
+        default=1,
+        type=int,
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(
+    sentences: List[str],
+    path_grid: str,
+    out_dir: str,
+    test_path: str,
+    senses_path: str = None,
+    jobs: int = 1,
+):
+    configs = expand_grid(read_grid(path_grid))
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # clean the corpora once, every job reads the cleaned file
+    corpus = out_dir / ("corpus_clean_" + corpus_key(sentences) + ".txt")
+    if not corpus.exists():
+        print("Cleaning corpora...")
+        # an interrupted run must not leave a partial cache behind
+        tmp = corpus.with_suffix(".tmp")
+        SentenceLoader(sentences).save(str(tmp))
+        os.replace(str(tmp), str(corpus))
+
+    workers = max(1, multiprocessing.cpu_count() // jobs)
+    print(len(configs), "jobs,", jobs, "in parallel with", workers, "workers each")
+    args = (
+        (config, str(corpus), str(out_dir), test_path, senses_path, workers)
+        for config in configs
+    )
+    # a new process for each job, to release the model memory
+    with multiprocessing.Pool(jobs, maxtasksperchild=1) as pool:
+        results = list(pool.imap_unordered(_run_job, args))
+
+    # a nan correlation goes to the bottom
+    results.sort(
+        key=lambda r: -1.0 if math.isnan(r["score"]) else r["score"], reverse=True
+    )
+    write_leaderboard(str(out_dir / "leaderboard.tsv"), results)
+    for rank, result in enumerate(results[:10], 1):
+        print(rank, "{:.4f}".format(result["score"]), result["config"])
+
+
+def cli(argv: List[str] = None):
+    args = parse_args(argv)
+    main(args.input, args.grid, args.output, args.test, args.map, args.jobs)
+
+
+if __name__ == "__main__":
+    cli()
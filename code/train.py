@@ -1,10 +1,11 @@
 import argparse
+import json
 import logging
 import multiprocessing
-from typing import List
-
-import gensim
-from gensim.models import Word2Vec, FastText
+import resource
+import time
+from collections import Counter
+from typing import Callable, List, Set
 
 import utils
 from sentence_loader import SentenceLoader
@@ -13,12 +14,41 @@ from sentence_loader import SentenceLoader
 def train_w2v(
     sentences: List[str],
     save_embeddings: str,
-    model: gensim.models = Word2Vec,
+    model=None,
     min_count: int = 3,
     iter: int = 5,
     size: int = 400,
     save_model: str = None,
+    sense_only: bool = False,
+    min_count_senses: int = None,
+    max_words: int = None,
+    window: int = 5,
+    hs: int = 1,
+    negative: int = 5,
+    workers: int = multiprocessing.cpu_count(),
+    cleaned: bool = False,
 ):
+    """
+    Train the embeddings on the given corpora.
+    :param sentences: paths to the corpora.
+    :param save_embeddings: where to save the embeddings.
+    :param model: gensim model, Word2Vec or FastText, Word2Vec if None.
+    :param min_count: ignores all words with total frequency lower than this.
+    :param iter: number of iterations over the corpus.
+    :param size: dimensionality of the feature vectors.
+    :param save_model: where to save the model.
+    :param sense_only: if True, plain words are only used as context and
+    only the lemma_synset vectors are saved.
+    :param min_count_senses: min_count for lemma_synset tokens, if given min_count
+    is used for plain words only.
+    :param max_words: max number of plain words in the vocab, sense only mode.
+    :param window: max distance between the current and the predicted word.
+    :param hs: if 1, hierarchical softmax is used.
+    :param negative: number of noise words for negative sampling, 0 to disable it.
+    :param workers: number of worker threads.
+    :param cleaned: if True, the corpora are already cleaned, see SentenceLoader.save.
+    :return:
+    """
     # Logs to monitor gensim
     logging.basicConfig(
         format="%(levelname)s - %(asctime)s: %(message)s",
@@ -26,23 +56,56 @@ def train_w2v(
         level=logging.INFO,
     )
 
+    if model is None:
+        from gensim.models import Word2Vec as model
+
     print(sentences)
-    loader = SentenceLoader(sentences)
+    loader = SentenceLoader(sentences, cleaned=cleaned)
+    trim_rule = None
+    if sense_only or min_count_senses is not None:
+        words = None
+        if sense_only and max_words:
+            start = time.time()
+            words = _most_frequent_words(loader, max_words)
+            print("Counting words:", utils.timer(start, time.time()))
+        trim_rule = sense_trim_rule(
+            min_count,
+            min_count_senses if min_count_senses is not None else min_count,
+            words,
+        )
+
     w2v_model = model(
-        sentences=loader,
         size=size,
-        window=5,
+        window=window,
         min_count=min_count,
-        workers=multiprocessing.cpu_count(),
-        hs=1,
+        workers=workers,
+        hs=hs,
+        negative=negative,
         sample=1e-3,
         iter=iter,
     )
+    start = time.time()
+    w2v_model.build_vocab(loader, trim_rule=trim_rule)
+    print("Building vocab:", utils.timer(start, time.time()))
+    print("Vocab size:", len(w2v_model.wv.vocab))
+    # only the training passes, vocab and counting passes are reported above
+    start = time.time()
+    _, raw_words = w2v_model.train(
+        loader, total_examples=w2v_model.corpus_count, epochs=w2v_model.epochs
+    )
+    elapsed = time.time() - start
+    print("Training:", utils.timer(start, start + elapsed))
+    print("Words/sec:", int(raw_words / elapsed))
+    # ru_maxrss is in kilobytes on linux
+    print("Peak RAM (MB):", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024)
 
     print("Saving vectors...")
-    w2v_model.wv.save_word2vec_format(save_embeddings, binary=False)
-    file, _, ext = save_embeddings.rpartition(".")
-    utils.clean_embeddings(save_embeddings, file + "_clean." + ext, size)
+    if sense_only:
+        utils.save_sense_vectors(save_embeddings, w2v_model.wv, size)
+    else:
+        w2v_model.wv.save_word2vec_format(save_embeddings, binary=False)
+        file, _, ext = save_embeddings.rpartition(".")
+        utils.clean_embeddings(save_embeddings, file + "_clean." + ext, size)
 
     if save_model:
         print("Saving model...")
@@ -50,7 +113,52 @@ def train_w2v(
     print("Done")
 
 
-def parse_args():
+def sense_trim_rule(
+    min_count_words: int, min_count_senses: int, words: Set[str] = None
+) -> Callable:
+    """
+    Build a gensim trim rule with different min_count for plain words and senses.
+    :param min_count_words: min_count for plain words.
+    :param min_count_senses: min_count for lemma_synset tokens.
+    :param words: if given, plain words to keep.
+    :return: the trim rule.
+    """
+    from gensim.utils import RULE_DISCARD, RULE_KEEP
+
+    def rule(word: str, count: int, min_count: int) -> int:
+        if "_bn:" in word:
+            return RULE_KEEP if count >= min_count_senses else RULE_DISCARD
+        if words is not None and word not in words:
+            return RULE_DISCARD
+        return RULE_KEEP if count >= min_count_words else RULE_DISCARD
+
+    return rule
+
+
+def _most_frequent_words(loader: SentenceLoader, max_words: int) -> Set[str]:
+    """
+    Count the plain words in the corpora and return the most frequent ones.
+    :param loader: corpora to read.
+    :param max_words: number of words to return.
+    :return: the set of the most frequent plain words.
+    """
+    counts = Counter()
+    for sentence in loader:
+        counts.update(word for word in sentence if "_bn:" not in word)
+    return {word for word, _ in counts.most_common(max_words)}
+
+
+def min_count_from_stats(path: str) -> int:
+    """
+    Read the suggested min_count from a statistics report, see stats.py.
+    :param path: path to the json report.
+    :return: the suggested min_count.
+    """
+    with open(path, encoding="utf8") as file:
+        return json.load(file)["suggested_min_count"]
+
+
+def parse_args(argv: List[str] = None):
     parser = argparse.ArgumentParser()
     parser.add_argument(nargs="+", help="paths to the corpora", dest="input")
     parser.add_argument(
@@ -75,6 +183,12 @@ def parse_args():
         default=3,
         type=int,
     )
+    parser.add_argument(
+        "--stats",
+        help="statistics report of the corpora, overrides min-count-senses "
+        "with the suggested one",
+        dest="stats",
+    )
     parser.add_argument(
         "--iter",
         help="number of iterations over the corpus",
@@ -89,8 +203,54 @@ def parse_args():
         default=400,
         type=int,
     )
+    parser.add_argument(
+        "--window",
+        help="max distance between the current and the predicted word",
+        dest="window",
+        default=5,
+        type=int,
+    )
+    parser.add_argument(
+        "--hs",
+        help="1 for hierarchical softmax, 0 to disable it",
+        dest="hs",
+        default=1,
+        type=int,
+    )
+    parser.add_argument(
+        "--negative",
+        help="number of noise words for negative sampling, 0 to disable it",
+        dest="negative",
+        default=5,
+        type=int,
+    )
+    parser.add_argument(
+        "--workers",
+        help="number of worker threads",
+        dest="workers",
+        default=multiprocessing.cpu_count(),
+        type=int,
+    )
+    parser.add_argument(
+        "--sense-only",
+        help="use plain words as context only and save only the sense vectors",
+        dest="sense_only",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--min-count-senses",
+        help="min-count for senses, min-count is then used for plain words only",
+        dest="min_count_senses",
+        type=int,
+    )
+    parser.add_argument(
+        "--max-words",
+        help="max number of plain words in the vocab, sense-only mode",
+        dest="max_words",
+        type=int,
+    )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def main(
@@ -101,13 +261,21 @@ def main(
     iter: int = 5,
     size: int = 400,
     save_model: str = None,
+    sense_only: bool = False,
+    min_count_senses: int = None,
+    max_words: int = None,
+    window: int = 5,
+    hs: int = 1,
+    negative: int = 5,
+    workers: int = multiprocessing.cpu_count(),
+    cleaned: bool = False,
 ):
     if model_type == "w2v":
         print("Word2Vec model")
-        model = Word2Vec
+        from gensim.models import Word2Vec as model
     elif model_type == "ft":
         print("FastText model")
-        model = FastText
+        from gensim.models import FastText as model
     else:
         print(
             "Model implementation not recognized. Use 'w2v' for Word2Vec or 'ft' for FastText."
@@ -122,11 +290,23 @@ def main(
         iter=iter,
         size=size,
         save_model=save_model,
+        sense_only=sense_only,
+        min_count_senses=min_count_senses,
+        max_words=max_words,
+        window=window,
+        hs=hs,
+        negative=negative,
+        workers=workers,
+        cleaned=cleaned,
     )
 
 
-if __name__ == "__main__":
-    args = parse_args()
+def cli(argv: List[str] = None):
+    args = parse_args(argv)
+    min_count_senses = args.min_count_senses
+    # the suggested min_count is computed on senses
+    if args.stats:
+        min_count_senses = min_count_from_stats(args.stats)
     main(
         sentences=args.input,
         save_embeddings=args.output,
@@ -135,4 +315,15 @@ if __name__ == "__main__":
         iter=args.iter,
         size=args.size,
         save_model=args.save_model,
+        sense_only=args.sense_only,
+        min_count_senses=min_count_senses,
+        max_words=args.max_words,
+        window=args.window,
+        hs=args.hs,
+        negative=args.negative,
+        workers=args.workers,
     )
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,5 +1,7 @@
+import multiprocessing
 from collections import defaultdict
 from itertools import chain
+from pathlib import Path
 from typing import List, Set, Dict
 
 
@@ -47,6 +49,20 @@ def write_dictionary(filename: str, dictionary: Dict):
             file.write(k + "\t" + "\t".join(v[0]) + "\n")
 
 
+def lang_paths(path: str, langs: List[str]) -> Dict[str, str]:
+    """
+    Build an output path for each language, appending the language to the file name.
+    :param path: base output path, e.g. parsed.txt.
+    :param langs: list of languages.
+    :return: a dictionary language -> path, e.g. en -> parsed_en.txt.
+    """
+    path = Path(path)
+    return {
+        lang: str(path.with_name(path.stem + "_" + lang + path.suffix))
+        for lang in langs
+    }
+
+
 def clean_embeddings(path_input: str, path_output: str, size: int):
     """
     Clean embeddings by removing non lemma_synset vectors.
@@ -59,40 +75,72 @@ def clean_embeddings(path_input: str, path_output: str, size: int):
     write_dataset(path_output, [str(len(filtered)) + " " + str(size)] + filtered)
 
 
+def save_sense_vectors(filename: str, vectors, size: int):
+    """
+    Writes only the lemma_synset vectors in the word2vec text format.
+    :param filename: path where to save the embeddings.
+    :param vectors: gensim word vectors.
+    :param size: dimensionality of the vectors.
+    :return:
+    """
+    senses = [word for word in vectors.vocab if "_bn:" in word]
+    with open(filename, mode="w", encoding="utf8") as file:
+        file.write(str(len(senses)) + " " + str(size) + "\n")
+        for sense in senses:
+            file.write(sense + " " + " ".join(str(v) for v in vectors[sense]) + "\n")
+
+
 def split_dataset(filename: str, n_split: int):
     """
-    Split a large text file in smaller files.
+    Split a large text file in smaller files, filename_1, ..., filename_n.
+    To split the work without copying the file, see sentence_loader.split_ranges.
     :param filename: file to split.
     :param n_split: number of parts to split.
     :return:
     """
     sew = read_dataset(filename)
-    batch = len(sew) // n_split
-    for i in range(0, len(sew), batch):
-        j = i + batch
-        filename_batch = str(filename).split(".")[0] + "_" + str(n_split) + ".txt"
+    bounds = [len(sew) * k // n_split for k in range(n_split + 1)]
+    path = Path(filename)
+    for n, (i, j) in enumerate(zip(bounds[:-1], bounds[1:]), 1):
+        filename_batch = str(path.with_name(path.stem + "_" + str(n) + path.suffix))
         print("Writing", filename_batch)
         write_dataset(filename_batch, sew[i:j])
-        n_split += 1
 
 
-def compute_word_sysnet_map(paths: List[str], mapping) -> Dict[str, Set]:
+def compute_word_sysnet_map(
+    paths: List[str], mapping, jobs: int = 1
+) -> Dict[str, Set]:
     """
     Produce a dictionary word -> synsets.
     :param paths: path of the input file.
     :param mapping: mapping file from bn to wn.
+    :param jobs: number of processes, each file is split in jobs byte ranges.
     :return: a dictionary of word and synsets.
     """
+    from sentence_loader import SentenceLoader, split_ranges
+
+    if jobs > 1:
+        ranges = [shard for path in paths for shard in split_ranges(path, jobs)]
+        with multiprocessing.Pool(jobs) as pool:
+            maps = pool.starmap(
+                compute_word_sysnet_map, (([shard], mapping) for shard in ranges)
+            )
+        word_synset_map = defaultdict(set)
+        for shard_map in maps:
+            for lemma, synsets in shard_map.items():
+                word_synset_map[lemma].update(synsets)
+        return word_synset_map
+
     word_synset_map = defaultdict(set)
     for path in paths:
-        with open(path) as file:
-            # flat list of words
-            words = chain.from_iterable(line.strip().split() for line in file)
-            # filter senses from words
-            senses = (s.lower().rpartition("_") for s in words if "_bn:" in s)
-            for lemma, _, synset in senses:
-                if synset in mapping:
-                    word_synset_map[lemma].add(synset)
+        lines = SentenceLoader.read_lines(path)
+        # flat list of words
+        words = chain.from_iterable(line.strip().split() for line in lines)
+        # filter senses from words
+        senses = (s.lower().rpartition("_") for s in words if "_bn:" in s)
+        for lemma, _, synset in senses:
+            if synset in mapping:
+                word_synset_map[lemma].add(synset)
 
     return word_synset_map
 
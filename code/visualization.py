@@ -1,11 +1,5 @@
 from typing import List
 
-import matplotlib.cm as cm
-import matplotlib.pyplot as plt
-import numpy as np
-from gensim.models import KeyedVectors
-from sklearn.manifold import TSNE
-
 
 def tsne_plot_cluster(senses, vectors, top_k: int = 30, png_path: str = None):
     """
@@ -16,6 +10,9 @@ def tsne_plot_cluster(senses, vectors, top_k: int = 30, png_path: str = None):
     :param png_path: path to png.
     :return:
     """
+    import numpy as np
+    from sklearn.manifold import TSNE
+
     embedding_clusters, word_clusters = [], []
     for sense in senses:
         embeddings, words = [], []
@@ -44,6 +41,10 @@ def _tsne_plot_similar_words(
     alpha: float,
     png_path=None,
 ):
+    import matplotlib.cm as cm
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     plt.figure(figsize=(16, 9))
     colors = cm.rainbow(np.linspace(0, 1, len(labels)))
     for label, embeddings, words, color in zip(
@@ -77,6 +78,8 @@ def plot(path_embeddings: str, png_path: str):
     :param png_path: where to save the png.
     :return:
     """
+    from gensim.models import KeyedVectors
+
     print("Load embeddings")
     vectors = KeyedVectors.load_word2vec_format(path_embeddings, binary=False)
     tsne_plot_cluster(
@@ -101,5 +104,7 @@ def word_similarity(words: List[str], path_embeddings: str, top_k: int = 6):
     :param top_k: number of similar words to retrieve.
     :return:
     """
+    from gensim.models import KeyedVectors
+
     vectors = KeyedVectors.load_word2vec_format(path_embeddings, binary=False)
     return [vectors.most_similar(word, topn=top_k) for word in words]
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "code"))
+
+from dedup import dedup  # noqa: E402
+
+WORDS = "the quick brown fox jumps over the lazy dog near the river bank".split()
+SENTENCE = " ".join(WORDS * 2)
+# one word changed out of 26, most trigrams are shared
+NEAR = " ".join(WORDS * 2 + ["today"])
+LINES = [
+    "a b c",
+    "d e f",
+    "a b c",
+    SENTENCE,
+    "g h i",
+    NEAR,
+    "a b c",
+    SENTENCE,
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text("".join(line + "\n" for line in LINES), encoding="utf8")
+    return path
+
+
+def _dedup(corpus, **kwargs):
+    output = corpus.with_name("dedup.txt")
+    report = dedup(str(corpus), str(output), **kwargs)
+    return output.read_text(encoding="utf8").splitlines(), report
+
+
+@pytest.mark.parametrize("partitions", [1, 7, 64])
+def test_exact_duplicates(corpus, partitions):
+    lines, report = _dedup(corpus, partitions=partitions)
+    assert lines == ["a b c", "d e f", SENTENCE, "g h i", NEAR]
+    assert report["lines"] == len(LINES)
+    assert report["exact_duplicates"] == 3
+    assert report["near_duplicates"] == 0
+    assert report["bytes"] == sum(len(line) + 1 for line in LINES)
+    assert report["bytes_saved"] == 2 * len("a b c\n") + len(SENTENCE) + 1
+    assert report["tokens"] == sum(len(line.split()) for line in LINES)
+    assert report["tokens_saved"] == 2 * 3 + len(SENTENCE.split())
+
+
+@pytest.mark.parametrize("partitions", [1, 7])
+def test_near_duplicates(corpus, partitions):
+    lines, report = _dedup(corpus, near=True, partitions=partitions)
+    assert lines == ["a b c", "d e f", SENTENCE, "g h i"]
+    # a line that is both an exact and a near duplicate counts as exact
+    assert report["exact_duplicates"] == 3
+    assert report["near_duplicates"] == 1
+    assert report["tokens_saved"] == 2 * 3 + 2 * len(SENTENCE.split()) + 1
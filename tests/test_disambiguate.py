@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+CODE_DIR = Path(__file__).resolve().parents[1] / "code"
+
+# a sentence with no context scores every sense 0
+TIE = """
+from types import SimpleNamespace
+import numpy as np
+from disambiguate import Disambiguator
+words = ["bank_bn:3n", "bank_bn:1n", "bank_bn:2n", "money"]
+vectors = SimpleNamespace(
+    index2word=words, vectors=np.random.RandomState(0).rand(4, 8)
+)
+senses = {"bank": {"bn:1n", "bn:2n", "bn:3n"}}
+disambiguator = Disambiguator(vectors, senses)
+print(disambiguator.disambiguate(["bank", "bank unknownword"]))
+"""
+
+
+def _run(seed: str) -> str:
+    env = dict(os.environ, PYTHONHASHSEED=seed)
+    result = subprocess.run(
+        [sys.executable, "-c", TIE],
+        cwd=str(CODE_DIR),
+        env=env,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_ties_do_not_depend_on_hash_seed():
+    pytest.importorskip("nltk")
+    outputs = {_run(seed) for seed in ("1", "2")}
+    # the most frequent sense wins
+    assert outputs == {"[['bank_bn:3n'], ['bank_bn:3n', 'unknownword']]"}
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "code"))
+
+import importtime  # noqa: E402
+
+HEAVY = {"gensim", "scipy", "lxml", "matplotlib", "nltk", "tqdm", "sklearn"}
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "cli",
+        "parse",
+        "score",
+        "train",
+        "stats",
+        "sweep",
+        "disambiguate",
+        "merge",
+        "dedup",
+        "visualization",
+    ],
+)
+def test_heavy_packages_are_lazy(module):
+    assert not importtime.imported_packages(module) & HEAVY
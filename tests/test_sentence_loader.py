@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "code"))
+
+import utils  # noqa: E402
+from sentence_loader import SentenceLoader, split_ranges  # noqa: E402
+
+# multi byte characters, an empty line and lines of different lengths
+LINES = ["città di roma\n", "\n", "naïve café\n", "a\n", "bank_bn:00008364n è qui\n"]
+
+
+def _write(tmp_path, text: str) -> Path:
+    path = tmp_path / "corpus.txt"
+    path.write_bytes(text.encode("utf8"))
+    return path
+
+
+def _read(ranges) -> list:
+    return [list(SentenceLoader.read_lines(r)) for r in ranges]
+
+
+def _owner(data: bytes, cuts: list) -> list:
+    """Expected lines of each range: a line belongs to the range of its first byte."""
+    bounds = [0] + cuts + [len(data)]
+    lines, start = [[] for _ in bounds[1:]], 0
+    for line in data.splitlines(keepends=True):
+        for i, (low, high) in enumerate(zip(bounds[:-1], bounds[1:])):
+            if low <= start < high:
+                lines[i].append(line.decode("utf8"))
+        start += len(line)
+    return lines
+
+
+@pytest.mark.parametrize("text", ["".join(LINES), "".join(LINES).rstrip("\n")])
+def test_every_cut_point(tmp_path, text):
+    path = _write(tmp_path, text)
+    data = path.read_bytes()
+    # every byte, including newlines and the middle of multi byte characters
+    for first in range(len(data) + 1):
+        for second in range(first, len(data) + 1):
+            cuts = [first, second]
+            bounds = [0] + cuts + [len(data)]
+            ranges = [(str(path), s, e) for s, e in zip(bounds[:-1], bounds[1:])]
+            assert _read(ranges) == _owner(data, cuts)
+
+
+def test_cut_on_newline_and_inside_character(tmp_path):
+    path = _write(tmp_path, "".join(LINES))
+    data = path.read_bytes()
+    newline = data.index(b"\n")
+    inside = data.index("à".encode("utf8")) + 1
+    ranges = [(str(path), 0, inside), (str(path), inside, newline)]
+    ranges.append((str(path), newline, newline + 1))
+    ranges.append((str(path), newline + 1, len(data)))
+    # the newline is the last byte of the first line, the next range
+    # starts with the empty line
+    assert _read(ranges) == [[LINES[0]], [], [], LINES[1:]]
+
+
+@pytest.mark.parametrize("text", ["".join(LINES), "".join(LINES).rstrip("\n")])
+@pytest.mark.parametrize("n_split", [1, 2, 3, len(LINES), len(LINES) + 4, 50])
+def test_split_ranges(tmp_path, text, n_split):
+    path = _write(tmp_path, text)
+    ranges = split_ranges(str(path), n_split)
+    assert 1 <= len(ranges) <= min(n_split, len(LINES))
+    # contiguous, line aligned and covering the whole file
+    assert ranges[0][1] == 0 and ranges[-1][2] == path.stat().st_size
+    assert all(a[2] == b[1] for a, b in zip(ranges[:-1], ranges[1:]))
+    parts = _read(ranges)
+    assert all(parts)
+    assert "".join(line for part in parts for line in part) == text
+
+
+@pytest.mark.parametrize("n_lines, n_split", [(10, 6), (10, 3), (12, 4), (3, 5)])
+def test_split_dataset(tmp_path, n_lines, n_split):
+    lines = ["line " + str(i) for i in range(n_lines)]
+    path = tmp_path / "corpus.txt"
+    utils.write_dataset(str(path), lines)
+    utils.split_dataset(str(path), n_split)
+    names = sorted(p.name for p in tmp_path.iterdir() if p != path)
+    assert names == sorted("corpus_" + str(n) + ".txt" for n in range(1, n_split + 1))
+    parts = [
+        utils.read_dataset(str(tmp_path / ("corpus_" + str(n) + ".txt")))
+        for n in range(1, n_split + 1)
+    ]
+    assert [line for part in parts for line in part] == lines
+    assert max(map(len, parts)) - min(map(len, parts)) <= 1